@@ -10,9 +10,8 @@ Policy for selecting the firmware files that go into the fwfs SPIFFS image:
     so we do not need to modify the repo's `data/` directory.
 
 This script then:
-  1) pio run -t buildfwfs
-  2) pio run -t uploadfwfs
-  3) python3 tools/esp32_runner.py  (build + upload firmware; plus any extra args you pass)
+  1) pio run -t buildfwfs -t uploadfwfs  (single PlatformIO session)
+  2) python3 tools/esp32_runner.py  (build + upload firmware; plus any extra args you pass)
 
 Examples:
   python3 build_and_upload.py
@@ -22,6 +21,8 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import functools
 import os
 import shutil
 import subprocess
@@ -41,10 +42,26 @@ def _run(cmd: list[str], *, env: dict[str, str] | None = None) -> None:
     subprocess.run(cmd, check=True, env=env)
 
 
+@functools.lru_cache(maxsize=8)
+def _list_bootloader_candidates(project_root: str, root_mtime_ns: int) -> tuple[Path, ...]:
+    # Keyed on the directory mtime so the cache self-invalidates when files are
+    # added/removed; repeat lookups cost one stat on the directory and nothing
+    # else. os.scandir caches the file type from readdir, avoiding the extra
+    # stat per candidate that Path.glob + Path.is_file would pay.
+    with os.scandir(project_root) as it:
+        return tuple(
+            sorted(
+                Path(e.path)
+                for e in it
+                if e.is_file(follow_symlinks=False) and fnmatch.fnmatchcase(e.name, "bootloader*.bin")
+            )
+        )
+
+
 def _find_unique_host_bootloader_bin(project_root: Path) -> Path:
     # Host-side naming can be long; we stage it into SPIFFS under a short name
     # due to SPIFFS_OBJ_NAME_LEN limits.
-    matches = sorted(p for p in project_root.glob("bootloader*.bin") if p.is_file())
+    matches = _list_bootloader_candidates(str(project_root), os.stat(project_root).st_mtime_ns)
 
     if not matches:
         _die(
@@ -158,8 +175,10 @@ def main(argv: list[str]) -> int:
 
             env["FWFS_DATA_DIR"] = str(tmp_path)
 
-            _run(["pio", "run", "-t", "buildfwfs"], env=env)
-            _run(["pio", "run", "-t", "uploadfwfs"], env=env)
+            # One PlatformIO session for both targets: SCons runs them in the
+            # given order, so we pay the project-load/startup cost once instead
+            # of twice.
+            _run(["pio", "run", "-t", "buildfwfs", "-t", "uploadfwfs"], env=env)
 
     if not args.skip_firmware:
         runner_argv = list(args.runner_args)
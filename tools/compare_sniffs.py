@@ -14,18 +14,43 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import mmap
 import re
+import struct
 from dataclasses import dataclass
+from typing import NamedTuple
+
+try:
+    # Optional: vectorizes the byte-compare hot path (20-100x on multi-MB captures).
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
 
 
 TOKEN_RE = re.compile(r"(?:0x)?([0-9A-Fa-f]{2})")
 
 
 def load_bytes(path: str) -> bytes:
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        text = f.read()
-    tokens = TOKEN_RE.findall(text)
-    return bytes(int(t, 16) for t in tokens)
+    # mmap the capture and stay in the bytes domain: the input is effectively
+    # ASCII hex, so a full UTF-8 decode pass (and the second in-memory copy it
+    # implies) is wasted work for multi-MB files.
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw = bytes(mm)
+        except (ValueError, OSError):
+            # Empty file or mmap-hostile filesystem.
+            raw = f.read()
+    # Fast path: drop "0x" prefixes and separators with translate(), then let
+    # the C-implemented bytes.fromhex() do the decode. Avoids one regex match
+    # plus one int() call per byte.
+    stripped = raw.replace(b"0x", b"").replace(b"0X", b"").translate(None, b" \t\r\n,;")
+    try:
+        return bytes.fromhex(stripped.decode("ascii"))
+    except (ValueError, UnicodeDecodeError):
+        # Stray non-hex characters: fall back to the tolerant regex tokenizer.
+        tokens = TOKEN_RE.findall(raw.decode("utf-8", errors="replace"))
+        return bytes(int(t, 16) for t in tokens)
 
 
 def fmt_hex(b: int) -> str:
@@ -40,47 +65,69 @@ class DiffResult:
     n_diffs: int
 
 
-def diff_bytes(a: bytes, b: bytes) -> DiffResult:
+def _mismatch_offsets(a: bytes, b: bytes) -> list[int]:
+    # Single comparison pass over the overlap. With numpy this is one SIMD-backed
+    # `!=` plus `flatnonzero` instead of one interpreter dispatch per byte.
     n = min(len(a), len(b))
-    first = None
-    n_diffs = 0
-    for i in range(n):
-        if a[i] != b[i]:
-            n_diffs += 1
-            if first is None:
-                first = i
-    # If lengths differ, count that as diffs too (but we keep first_diff as first differing index within overlap).
-    n_diffs += abs(len(a) - len(b))
-    return DiffResult(len(a), len(b), first, n_diffs)
+    if np is not None:
+        aa = np.frombuffer(a, dtype=np.uint8, count=n)
+        bb = np.frombuffer(b, dtype=np.uint8, count=n)
+        return np.flatnonzero(aa != bb).tolist()
+    return [i for i in range(n) if a[i] != b[i]]
 
 
-def list_mismatch_offsets(a: bytes, b: bytes) -> list[int]:
-    n = min(len(a), len(b))
-    return [i for i in range(n) if a[i] != b[i]]
+def diff_bytes(a: bytes, b: bytes) -> tuple[DiffResult, list[int]]:
+    """Compare once; return the summary plus the mismatch offsets it found."""
+    mism = _mismatch_offsets(a, b)
+    first = mism[0] if mism else None
+    # If lengths differ, count that as diffs too (but we keep first_diff as first differing index within overlap).
+    n_diffs = len(mism) + abs(len(a) - len(b))
+    return DiffResult(len(a), len(b), first, n_diffs), mism
 
 
 def summarize_offset_ranges(offsets: list[int]) -> str:
     if not offsets:
         return "(none)"
-    ranges: list[tuple[int, int]] = []
-    start = prev = offsets[0]
-    for x in offsets[1:]:
-        if x == prev + 1:
-            prev = x
-            continue
+    if np is not None:
+        # Vectorized run-length detection: a run ends wherever consecutive
+        # offsets are not adjacent. Only the final stringify stays in Python.
+        arr = np.asarray(offsets)
+        breaks = np.flatnonzero(np.diff(arr) != 1)
+        starts = arr[np.r_[0, breaks + 1]].tolist()
+        ends = arr[np.r_[breaks, -1]].tolist()
+        ranges = list(zip(starts, ends))
+    else:
+        ranges = []
+        start = prev = offsets[0]
+        for x in offsets[1:]:
+            if x == prev + 1:
+                prev = x
+                continue
+            ranges.append((start, prev))
+            start = prev = x
         ranges.append((start, prev))
-        start = prev = x
-    ranges.append((start, prev))
-    parts = []
-    for lo, hi in ranges:
-        if lo == hi:
-            parts.append(f"0x{lo:X}")
-        else:
-            parts.append(f"0x{lo:X}..0x{hi:X}")
-    return ", ".join(parts)
+    return ", ".join(
+        f"0x{lo:X}" if lo == hi else f"0x{lo:X}..0x{hi:X}" for lo, hi in ranges
+    )
 
 
-def parse_packet_fields(buf: bytes) -> dict[str, tuple[int, int]]:
+class PacketFields(NamedTuple):
+    """(lo, hi) byte spans per field; None when the field is absent.
+
+    Attribute access keeps the hot per-offset membership checks free of dict
+    hashing.
+    """
+
+    size_bytes: tuple[int, int] | None = None
+    extended_addressing_byte: tuple[int, int] | None = None
+    unique_id_le: tuple[int, int] | None = None
+    alias: tuple[int, int] | None = None
+    command_id: tuple[int, int] | None = None
+    payload: tuple[int, int] | None = None
+    crc32_le: tuple[int, int] | None = None
+
+
+def parse_packet_fields(buf: bytes) -> PacketFields:
     """Best-effort field map for the Servomotor protocol.
 
     Format (TX):
@@ -93,53 +140,62 @@ def parse_packet_fields(buf: bytes) -> dict[str, tuple[int, int]]:
 
     We can't know crc-enabled from sniff alone, but in this project it is typically enabled.
     """
-    m: dict[str, tuple[int, int]] = {}
     if not buf:
-        return m
+        return PacketFields()
 
-    size0 = buf[0] >> 1
+    (size0,) = struct.unpack_from("<B", buf, 0)
+    size0 >>= 1
     extended = size0 == 127 and len(buf) >= 3
-    off = 1
-    if extended:
-        m["size_bytes"] = (0, 3)
-        off = 3
-    else:
-        m["size_bytes"] = (0, 1)
-        off = 1
+    off = 3 if extended else 1
+    size_bytes = (0, off)
 
     if off >= len(buf):
-        return m
+        return PacketFields(size_bytes=size_bytes)
 
+    ext_byte = None
+    unique_id = None
+    alias = None
     if buf[off] == 0xFE and off + 1 + 8 < len(buf):
-        m["extended_addressing_byte"] = (off, off + 1)
-        m["unique_id_le"] = (off + 1, off + 1 + 8)
+        ext_byte = (off, off + 1)
+        unique_id = (off + 1, off + 1 + 8)
         off = off + 1 + 8
     else:
-        m["alias"] = (off, off + 1)
+        alias = (off, off + 1)
         off = off + 1
 
+    command_id = None
     if off < len(buf):
-        m["command_id"] = (off, off + 1)
+        command_id = (off, off + 1)
         off += 1
 
     # Assume CRC32 is present (most common in this codebase). If too short, treat as no-CRC.
+    crc32_le = None
     if len(buf) >= off + 4:
-        m["payload"] = (off, len(buf) - 4)
-        m["crc32_le"] = (len(buf) - 4, len(buf))
+        payload = (off, len(buf) - 4)
+        crc32_le = (len(buf) - 4, len(buf))
     else:
-        m["payload"] = (off, len(buf))
-    return m
+        payload = (off, len(buf))
+    return PacketFields(
+        size_bytes=size_bytes,
+        extended_addressing_byte=ext_byte,
+        unique_id_le=unique_id,
+        alias=alias,
+        command_id=command_id,
+        payload=payload,
+        crc32_le=crc32_le,
+    )
 
 
 def hexdump_slice(buf: bytes, start: int, end: int, cols: int = 16) -> str:
-    out: list[str] = []
     start = max(0, start)
     end = min(len(buf), end)
-    for row_off in range(start - (start % cols), end, cols):
-        row = buf[row_off : row_off + cols]
-        hexpart = " ".join(f"{b:02X}" for b in row)
-        out.append(f"{row_off:08X}: {hexpart}")
-    return "\n".join(out)
+    # bytes.hex(sep) formats a whole row in one C call instead of one f-string
+    # per byte; memoryview avoids copying the row out of the capture buffer.
+    mv = memoryview(buf)
+    return "\n".join(
+        f"{row_off:08X}: {bytes(mv[row_off : row_off + cols]).hex(' ').upper()}"
+        for row_off in range(start - (start % cols), end, cols)
+    )
 
 
 def main() -> int:
@@ -152,7 +208,7 @@ def main() -> int:
     a = load_bytes(args.file_a)
     b = load_bytes(args.file_b)
 
-    r = diff_bytes(a, b)
+    r, mism = diff_bytes(a, b)
     print(f"A: {args.file_a} -> {r.len_a} bytes")
     print(f"B: {args.file_b} -> {r.len_b} bytes")
 
@@ -178,7 +234,6 @@ def main() -> int:
     print(f"DIFF: first mismatch at offset {i} (0x{i:X})")
     print(f"  A[{i}]={fmt_hex(a[i])}  B[{i}]={fmt_hex(b[i])}")
 
-    mism = list_mismatch_offsets(a, b)
     print(f"DIFF: mismatches_in_overlap={len(mism)}")
     print("DIFF: mismatch ranges:")
     print("  " + summarize_offset_ranges(mism))
@@ -187,19 +242,16 @@ def main() -> int:
     fa = parse_packet_fields(a)
     fb = parse_packet_fields(b)
     # Use A's map (should match B structurally).
-    def in_field(off: int, field: str) -> bool:
-        if field not in fa:
-            return False
-        lo, hi = fa[field]
-        return lo <= off < hi
+    def in_field(off: int, span: tuple[int, int] | None) -> bool:
+        return span is not None and span[0] <= off < span[1]
 
     if mism:
-        uniq = all(in_field(off, "unique_id_le") for off in mism)
+        uniq = all(in_field(off, fa.unique_id_le) for off in mism)
         if uniq:
             print("NOTE: all mismatches are within unique_id_le (device unique ID differs)")
         else:
-            uniq_crc = all(in_field(off, "unique_id_le") or in_field(off, "crc32_le") for off in mism)
-            if uniq_crc and "crc32_le" in fa:
+            uniq_crc = all(in_field(off, fa.unique_id_le) or in_field(off, fa.crc32_le) for off in mism)
+            if uniq_crc and fa.crc32_le is not None:
                 print("NOTE: mismatches are confined to unique_id_le and crc32_le (CRC changes when unique ID differs)")
 
     # Show a small window around the mismatch
@@ -211,9 +263,7 @@ def main() -> int:
     print(hexdump_slice(b, lo, hi))
 
     # Also report total number of mismatched positions within overlap
-    n = min(len(a), len(b))
-    mismatches = sum(1 for j in range(n) if a[j] != b[j])
-    print(f"\nSummary: mismatches_in_overlap={mismatches}, len_a={len(a)}, len_b={len(b)}")
+    print(f"\nSummary: mismatches_in_overlap={len(mism)}, len_a={len(a)}, len_b={len(b)}")
     return 1
 
 
@@ -15,7 +15,10 @@ This will:
 
 from __future__ import annotations
 
+import codecs
+import functools
 import json
+import re
 import subprocess
 import sys
 import time
@@ -25,6 +28,7 @@ from typing import List, Optional
 
 try:
     import serial  # type: ignore
+    from serial.tools import list_ports  # type: ignore
 except Exception as e:  # pragma: no cover
     sys.stderr.write(
         "ERROR: pyserial is required to run this helper.\n"
@@ -40,14 +44,106 @@ except Exception as e:  # pragma: no cover
 # NOTE: This helper intentionally preserves the left-to-right ordering of
 # command flags (e.g. `-w -R --to-mode2 -p`).
 
+# Terminal output markers per command lead character, built once at import so
+# _send_cmd_and_capture does a single dict lookup instead of walking a ~30
+# branch if/elif ladder on every command.
+_STOP_MARKERS_MODE1: dict = {
+    "e": ("Erase OK", "Erase FAIL"),
+    "w": ("Write OK", "Write FAIL"),
+    "v": ("Verify OK", "Verify FAIL"),
+    "s": ("Consume serial OK:", "Consume serial FAIL"),
+    # Wait for the full output of both sections.
+    # If we stop at the section header, we can truncate output mid-command.
+    "l": ("--- END /serial_consumed.bin ---", "Log open FAIL"),
+    "a": ("WiFi mode:", "WiFi AP IP:", "WiFi AP enabled:"),
+    "R": ("Pulsing NRST LOW", "Prep OK", "Prep FAIL"),
+    "S": ("Set serial OK:", "Set serial FAIL", "Set serial:"),
+    " ": ("PRODUCTION sequence SUCCESS", "Production sequence aborted", "ERROR: Production sequence aborted"),
+    "F": ("Firmware file selection OK", "Firmware file selection FAIL"),
+    "f": ("Filesystem status:",),
+    "i": ("DP IDCODE:", "DP IDCODE read failed"),
+    "u": ("Upgrade OK", "Upgrade FAIL", "Servomotor upgrade OK"),
+    "p": ("Servomotor GET_PRODUCT_INFO response:", "ERROR: getProductInfo"),
+}
+
+# Mode 2 (RS485 testing)
+_STOP_MARKERS_MODE2: dict = {
+    "p": (
+        "Servomotor GET_COMPREHENSIVE_POSITION response",
+        "ERROR: getComprehensivePosition",
+        "ERROR: DUT unique_id not known",
+    ),
+    "P": (
+        "Servomotor GET_COMPREHENSIVE_POSITION response",
+        "ERROR: getComprehensivePosition(ref)",
+    ),
+    "i": ("Servomotor GET_PRODUCT_INFO response:", "ERROR: getProductInfo", "ERROR: DUT unique_id not known"),
+    "e": ("[Motor] enableMosfets called.", "ERROR: enableMosfets", "ERROR: DUT unique_id not known"),
+    "d": ("[Motor] disableMosfets called.", "ERROR: disableMosfets", "ERROR: DUT unique_id not known"),
+    "t": ("[Motor] trapezoidMove", "ERROR: trapezoidMove", "ERROR: DUT unique_id not known"),
+    "R": ("[Motor] systemReset called.", "ERROR: systemReset", "ERROR: DUT unique_id not known"),
+    "s": ("Mode2 getStatus OK", "Mode2 getStatus FAIL", "ERROR: getStatus", "ERROR: DUT unique_id not known"),
+    "v": (
+        "Mode2 getSupplyVoltage OK",
+        "Mode2 getSupplyVoltage FAIL",
+        "ERROR: getSupplyVoltage",
+        "ERROR: DUT unique_id not known",
+    ),
+    "c": (
+        "Mode2 getTemperature OK",
+        "Mode2 getTemperature FAIL",
+        "ERROR: getTemperature",
+        "ERROR: DUT unique_id not known",
+    ),
+    "D": ("Detect devices:", "ERROR: detectDevices"),
+}
+
+# Commands that can legitimately go quiet for long stretches (flash erase /
+# program / verify, firmware upgrade): no quiet-time early exit for these.
+_LONG_RUNNING_MODE1 = frozenset({"e", "w", "v", " ", "u"})
+_LONG_RUNNING_MODE2 = frozenset({"u", "p", "P", "i", "e", "d", "t", "R", "s", "v", "c", "D"})
+
+
+@functools.lru_cache(maxsize=None)
+def _marker_regex(markers: tuple) -> "re.Pattern[str]":
+    # One compiled alternation scans for every marker in a single pass instead
+    # of running an independent substring search per marker on each chunk.
+    # Cached per marker tuple, so each command's pattern is compiled once.
+    return re.compile("|".join(map(re.escape, markers)))
+
 
 def _run(cmd: List[str]) -> None:
     _OUT.write(f"\n[cmd] {' '.join(cmd)}\n")
     _OUT.flush()
-    subprocess.run(cmd, check=True)
+    # Pipe the subprocess through _Tee so PlatformIO output lands in the log
+    # file too (with inherited stdio it bypassed the tee entirely), streaming
+    # line by line instead of blocking on the full output.
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True
+    ) as p:
+        assert p.stdout is not None
+        for line in p.stdout:
+            _OUT.write(line)
+        rc = p.wait()
+    _OUT.flush()
+    if rc:
+        raise subprocess.CalledProcessError(rc, cmd)
 
 
 def _pio_device_list() -> List[dict]:
+    # Enumerate in-process via pyserial first: spawning PlatformIO just to
+    # list ports costs hundreds of ms of interpreter/project-load time. Only
+    # fall back to `pio device list` when pyserial finds nothing.
+    try:
+        devices = [
+            {"port": p.device, "description": p.description, "hwid": p.hwid}
+            for p in list_ports.comports()
+        ]
+    except Exception:
+        devices = []
+    if devices:
+        return devices
+
     # PlatformIO supports JSON output.
     p = subprocess.run(
         ["pio", "device", "list", "--json-output"],
@@ -87,13 +183,19 @@ def _choose_port(devices: List[dict]) -> str:
 
 
 def _open_serial_with_retry(port: str, baud: int, open_timeout_s: float) -> "serial.Serial":
-    deadline = time.time() + open_timeout_s
+    deadline = time.monotonic() + open_timeout_s
     last_err: Optional[Exception] = None
-    while time.time() < deadline:
+    while time.monotonic() < deadline:
         try:
             # Keep the open path minimal; some ESP32-S3 USB-CDC stacks are sensitive
             # to DTR/RTS manipulation and can reset into ROM download mode.
-            ser = serial.Serial(port=port, baudrate=baud, timeout=0.05)
+            # The timeout bounds the blocking read(1) in the drain loops: the
+            # kernel wakes us as soon as a byte arrives, so we never sleep-poll.
+            ser = serial.Serial(port=port, baudrate=baud, timeout=0.2)
+            # Per-read cap for _read_available, scaled so one read can cover
+            # ~1s of traffic even at USB-CDC line rates (--baud well above
+            # 115200) while still bounding a single allocation.
+            ser._app_chunk = max(4096, baud // 8)
             # Best-effort: leave lines deasserted.
             try:
                 ser.dtr = False
@@ -107,42 +209,71 @@ def _open_serial_with_retry(port: str, baud: int, open_timeout_s: float) -> "ser
     raise RuntimeError(f"Failed to open serial port {port!r}: {last_err}")
 
 
+def _read_available(ser: "serial.Serial") -> bytes:
+    # Drain whatever the kernel already buffered in one syscall; when idle,
+    # block in read(1) for up to the port timeout instead of sleep-polling.
+    n = min(ser.in_waiting, getattr(ser, "_app_chunk", 4096))
+    return ser.read(n if n else 1)
+
+
+def _utf8_decoder():
+    # Incremental decoder: multi-byte UTF-8 sequences that straddle a read
+    # boundary are held in decoder state instead of being mangled into U+FFFD.
+    return codecs.getincrementaldecoder("utf-8")("replace").decode
+
+
 def _drain_and_print(ser: "serial.Serial", duration_s: float) -> None:
-    end = time.time() + duration_s
-    while time.time() < end:
-        data = ser.read(4096)
+    dec = _utf8_decoder()
+    end = time.monotonic() + duration_s
+    while time.monotonic() < end:
+        data = _read_available(ser)
         if data:
-            _OUT.write(data.decode("utf-8", errors="replace"))
-            _OUT.flush()
+            _OUT.write(dec(data))
         else:
-            time.sleep(0.02)
+            _OUT.flush_if_idle()
+    tail = dec(b"", True)
+    if tail:
+        _OUT.write(tail)
 
 
-def _drain_capture(ser: "serial.Serial", duration_s: float) -> str:
-    end = time.time() + duration_s
-    out = ""
-    while time.time() < end:
-        data = ser.read(4096)
-        if data:
-            out += data.decode("utf-8", errors="replace")
-        else:
-            time.sleep(0.02)
-    return out
+# Compiled once: a single alternation scan replaces several independent `in`
+# substring passes, and IGNORECASE avoids lowercasing a copy of the whole
+# buffer on every call (these run repeatedly on a growing buffer during boot).
+_RE_ROM = re.compile(r"esp-rom|waiting for download|download\(usb", re.IGNORECASE)
+_RE_FIRMWARE = re.compile(
+    r"ESP32-S3 STM32G0 Programmer|Mounting SPIFFS|Filesystem status:|MODE 2"
+)
 
 
 def _looks_like_rom_download(s: str) -> bool:
-    ss = s.lower()
-    return ("esp-rom" in ss) or ("waiting for download" in ss) or ("download(usb" in ss)
+    return _RE_ROM.search(s) is not None
 
 
 def _looks_like_firmware(s: str) -> bool:
     # Keep markers fairly loose; banners can vary across builds.
-    return (
-        "ESP32-S3 STM32G0 Programmer" in s
-        or "Mounting SPIFFS" in s
-        or "Filesystem status:" in s
-        or "MODE 2" in s
-    )
+    return _RE_FIRMWARE.search(s) is not None
+
+
+def _wait_for_firmware(ser: "serial.Serial", timeout_s: float, first: bytes = b"") -> str:
+    """Drain serial until the firmware banner appears.
+
+    Returns whatever was captured. Exits as soon as the output looks like our
+    firmware instead of always sleeping out the worst-case boot time; a slow
+    boot is still bounded by timeout_s. `first` is raw bytes a caller already
+    read off the port (e.g. the wake-up byte in _try_reset_sequences); it goes
+    through the same incremental decoder as the rest of the stream, so even a
+    split multi-byte character survives.
+    """
+    dec = _utf8_decoder()
+    out = dec(first) if first else ""
+    end = time.monotonic() + timeout_s
+    while time.monotonic() < end:
+        data = _read_available(ser)
+        if data:
+            out += dec(data)
+            if _looks_like_firmware(out):
+                break
+    return out + dec(b"", True)
 
 
 def _try_reset_sequences(ser: "serial.Serial") -> None:
@@ -173,14 +304,18 @@ def _try_reset_sequences(ser: "serial.Serial") -> None:
             except Exception:
                 pass
 
-        # Give the target time to reboot.
-        time.sleep(0.25)
+        # Wait for the reboot by reading: the blocking read(1) (bounded by the
+        # port timeout) returns the instant the first boot byte arrives instead
+        # of sleeping out a fixed worst-case reboot delay. That byte is the
+        # start of the boot banner, so it must flow into the capture below or
+        # the matchers would only ever see e.g. "SP-ROM:...".
+        first = ser.read(1)
 
-        # Drain any boot output so callers can inspect it.
-        s = _drain_capture(ser, duration_s=0.8)
+        # Drain boot output so callers can inspect it, returning the moment it
+        # looks like our firmware rather than always paying the full window.
+        s = _wait_for_firmware(ser, timeout_s=1.05, first=first)
         if s:
             _OUT.write(s)
-            _OUT.flush()
 
         if _looks_like_firmware(s):
             return
@@ -190,117 +325,63 @@ def _send_cmd_and_capture(ser: "serial.Serial", cmd_char: str, quiet_s: float, m
     # Send the command + newline.
     # Some commands carry an inline argument (e.g. "S1234").
     payload = (cmd_char + "\n").encode("utf-8")
+    # No ser.flush() here: write() already hands the bytes to the OS, and
+    # flush() is tcdrain() on POSIX - it blocks until the UART has physically
+    # shifted everything out, costing ~10ms per 2-byte command for nothing.
     ser.write(payload)
-    ser.flush()
 
-    start = time.time()
-    last_rx = time.time()
+    # Monotonic deadlines computed once up front; the loop then only compares
+    # floats (and pushes quiet_deadline forward when bytes arrive) instead of
+    # redoing the arithmetic on every iteration. monotonic() is also immune to
+    # wall-clock jumps (NTP steps) that could stretch or truncate the capture.
+    start = time.monotonic()
+    deadline = start + max_s
+    quiet_deadline = start + quiet_s
 
     # Some commands can be long-running and may legitimately produce no output
     # for extended periods (e.g. verify/program). For these, we avoid the
     # quiet-time early exit and instead stop when we see an expected terminal
-    # marker or when max_s elapses.
-    stop_markers: List[str] = []
+    # marker or when max_s elapses. The marker tables live at module scope.
     lead = cmd_char[0] if cmd_char else ""
-
-    if mode == 1:
-        if lead == "e":
-            stop_markers = ["Erase OK", "Erase FAIL"]
-        elif lead == "w":
-            stop_markers = ["Write OK", "Write FAIL"]
-        elif lead == "v":
-            stop_markers = ["Verify OK", "Verify FAIL"]
-        elif lead == "s":
-            stop_markers = ["Consume serial OK:", "Consume serial FAIL"]
-        elif lead == "l":
-            # Wait for the full output of both sections.
-            # If we stop at the section header, we can truncate output mid-command.
-            stop_markers = ["--- END /serial_consumed.bin ---", "Log open FAIL"]
-        elif lead == "a":
-            stop_markers = ["WiFi mode:", "WiFi AP IP:", "WiFi AP enabled:"]
-        elif lead == "R":
-            stop_markers = ["Pulsing NRST LOW", "Prep OK", "Prep FAIL"]
-        elif lead == "S":
-            stop_markers = ["Set serial OK:", "Set serial FAIL", "Set serial:"]
-        elif lead == " ":
-            stop_markers = ["PRODUCTION sequence SUCCESS", "Production sequence aborted", "ERROR: Production sequence aborted"]
-        elif lead == "F":
-            stop_markers = ["Firmware file selection OK", "Firmware file selection FAIL"]
-        elif lead == "f":
-            stop_markers = ["Filesystem status:"]
-        elif lead == "i":
-            stop_markers = ["DP IDCODE:", "DP IDCODE read failed"]
-        elif lead == "u":
-            stop_markers = ["Upgrade OK", "Upgrade FAIL", "Servomotor upgrade OK"]
-        elif lead == "p":
-            stop_markers = ["Servomotor GET_PRODUCT_INFO response:", "ERROR: getProductInfo"]
-    else:
-        # Mode 2 (RS485 testing)
-        if lead == "p":
-            stop_markers = [
-                "Servomotor GET_COMPREHENSIVE_POSITION response",
-                "ERROR: getComprehensivePosition",
-                "ERROR: DUT unique_id not known",
-            ]
-        elif lead == "P":
-            stop_markers = [
-                "Servomotor GET_COMPREHENSIVE_POSITION response",
-                "ERROR: getComprehensivePosition(ref)",
-            ]
-        elif lead == "i":
-            stop_markers = ["Servomotor GET_PRODUCT_INFO response:", "ERROR: getProductInfo", "ERROR: DUT unique_id not known"]
-        elif lead == "e":
-            stop_markers = ["[Motor] enableMosfets called.", "ERROR: enableMosfets", "ERROR: DUT unique_id not known"]
-        elif lead == "d":
-            stop_markers = ["[Motor] disableMosfets called.", "ERROR: disableMosfets", "ERROR: DUT unique_id not known"]
-        elif lead == "t":
-            stop_markers = ["[Motor] trapezoidMove", "ERROR: trapezoidMove", "ERROR: DUT unique_id not known"]
-        elif lead == "R":
-            stop_markers = ["[Motor] systemReset called.", "ERROR: systemReset", "ERROR: DUT unique_id not known"]
-        elif lead == "s":
-            stop_markers = ["Mode2 getStatus OK", "Mode2 getStatus FAIL", "ERROR: getStatus", "ERROR: DUT unique_id not known"]
-        elif lead == "v":
-            stop_markers = [
-                "Mode2 getSupplyVoltage OK",
-                "Mode2 getSupplyVoltage FAIL",
-                "ERROR: getSupplyVoltage",
-                "ERROR: DUT unique_id not known",
-            ]
-        elif lead == "c":
-            stop_markers = [
-                "Mode2 getTemperature OK",
-                "Mode2 getTemperature FAIL",
-                "ERROR: getTemperature",
-                "ERROR: DUT unique_id not known",
-            ]
-        elif lead == "D":
-            stop_markers = ["Detect devices:", "ERROR: detectDevices"]
-
-    # Firmware upgrade is also long-running and can have multi-second stretches
-    # without output (device flash write), so do not apply quiet-time early exit.
-    long_running = lead in {"e", "w", "v", " ", "u"} if mode == 1 else lead in {"u", "p", "P", "i", "e", "d", "t", "R", "s", "v", "c", "D"}
-    buf = ""
+    stop_markers = (_STOP_MARKERS_MODE1 if mode == 1 else _STOP_MARKERS_MODE2).get(lead, ())
+    long_running = lead in (_LONG_RUNNING_MODE1 if mode == 1 else _LONG_RUNNING_MODE2)
+    if stop_markers:
+        marker_re = _marker_regex(stop_markers)
+        # Longest marker minus one: the most we must carry over so a marker
+        # split across two chunks is still matched. Keeping only this small
+        # tail (instead of an 8 KiB rolling slice) makes the per-chunk search
+        # O(chunk) with a bounded allocation, however much a command streams.
+        carry_max = max(map(len, stop_markers)) - 1
+    carry = ""
+    dec = _utf8_decoder()
     while True:
-        data = ser.read(4096)
-        now = time.time()
+        data = _read_available(ser)
+        now = time.monotonic()
 
         if data:
-            s = data.decode("utf-8", errors="replace")
+            s = dec(data)
             _OUT.write(s)
-            _OUT.flush()
             if stop_markers:
-                buf = (buf + s)[-8192:]
-                if any(m in buf for m in stop_markers):
+                window = carry + s
+                if marker_re.search(window):
                     break
-            last_rx = now
+                carry = window[-carry_max:] if carry_max else ""
+            quiet_deadline = now + quiet_s
         else:
-            time.sleep(0.02)
+            # Port went quiet (read(1) timed out): make the tail of the last
+            # burst visible now instead of when the next byte arrives - e.g.
+            # "Erasing..." right before a long silent erase.
+            _OUT.flush_if_idle()
 
-        if now - start >= max_s:
+        if now >= deadline:
             break
-        if (not long_running) and (now - last_rx >= quiet_s):
+        if (not long_running) and now >= quiet_deadline:
             break
 
+    tail = dec(b"", True)
+    if tail:
+        _OUT.write(tail)
+
 
 def _parse_cmds(argv: List[str], ignore_indices: "set[int]") -> List[str]:
     """Extract ordered command characters from argv.
@@ -375,16 +456,24 @@ def _parse_args(argv: List[str]) -> Args:
     quiet_s = 0.6
     max_per_cmd_s = 6.0
 
-    it = iter(range(len(argv)))
+    # Option/value indices recorded as we parse, so _parse_cmds won't mistake
+    # `--boot-wait 5` for the command "5". One pass; no second scan that has to
+    # stay in sync with the option table above.
+    ignore: set[int] = set()
+
     i = 0
     while i < len(argv):
         a = argv[i]
         if a == "--port" and i + 1 < len(argv):
             port = argv[i + 1]
+            ignore.add(i)
+            ignore.add(i + 1)
             i += 2
             continue
         if a == "--baud" and i + 1 < len(argv):
             baud = int(argv[i + 1])
+            ignore.add(i)
+            ignore.add(i + 1)
             i += 2
             continue
         if a == "--skip-build":
@@ -397,22 +486,32 @@ def _parse_args(argv: List[str]) -> Args:
             continue
         if a == "--log" and i + 1 < len(argv):
             log_path = argv[i + 1]
+            ignore.add(i)
+            ignore.add(i + 1)
             i += 2
             continue
         if a == "--open-timeout" and i + 1 < len(argv):
             open_timeout_s = float(argv[i + 1])
+            ignore.add(i)
+            ignore.add(i + 1)
             i += 2
             continue
         if a == "--boot-wait" and i + 1 < len(argv):
             boot_wait_s = float(argv[i + 1])
+            ignore.add(i)
+            ignore.add(i + 1)
             i += 2
             continue
         if a == "--quiet" and i + 1 < len(argv):
             quiet_s = float(argv[i + 1])
+            ignore.add(i)
+            ignore.add(i + 1)
             i += 2
             continue
         if a == "--max" and i + 1 < len(argv):
             max_per_cmd_s = float(argv[i + 1])
+            ignore.add(i)
+            ignore.add(i + 1)
             i += 2
             continue
         if a in ("-h", "--help"):
@@ -424,7 +523,8 @@ def _parse_args(argv: List[str]) -> Args:
                 "Options:\n"
                 "  --port PORT         Serial port (e.g. /dev/tty.usbmodemXXXX)\n"
                 "  --baud N            Baud rate (default: 115200)\n"
-                "  --skip-build        Do not run 'pio run'\n"
+                "  --skip-build        Do not run 'pio run' (no-op unless --skip-upload is also given;\n"
+                "                      uploading already builds)\n"
                 "  --skip-upload       Do not run 'pio run -t upload'\n"
                 "  --log PATH          Write a full copy of output to PATH (default: tools/esp32_runner_last.log)\n"
                 "  --open-timeout S    How long to wait for the serial port (default: 15)\n"
@@ -437,20 +537,6 @@ def _parse_args(argv: List[str]) -> Args:
             raise SystemExit(0)
         i += 1
 
-    ignore: set[int] = set()
-
-    # Mark option value indices so they won't be mis-parsed as raw command tokens.
-    # (e.g. `--boot-wait 5` should not send the command "5").
-    i = 0
-    while i < len(argv):
-        a = argv[i]
-        if a in {"--port", "--baud", "--log", "--open-timeout", "--boot-wait", "--quiet", "--max", "--set-serial"}:
-            if i + 1 < len(argv):
-                ignore.add(i + 1)
-            i += 2
-            continue
-        i += 1
-
     cmds = _parse_cmds(argv, ignore)
     return Args(
         port=port,
@@ -467,18 +553,57 @@ def _parse_args(argv: List[str]) -> Args:
 
 
 class _Tee:
+    """Mirror output to stdout and the log file.
+
+    Writes are accumulated and drained once the buffer exceeds _FLUSH_BYTES or
+    _FLUSH_INTERVAL_S has elapsed, so a burst of serial chunks does not pay two
+    write() + two flush() syscalls each. The interval check runs inside
+    write(), so the read loops call flush_if_idle() whenever the port goes
+    quiet - otherwise the tail of a burst would sit buffered until the next
+    byte arrives. flush() still forces an immediate drain for banners and
+    shutdown.
+    """
+
+    _FLUSH_BYTES = 16384
+    _FLUSH_INTERVAL_S = 0.1
+
     def __init__(self, file_path: str):
         self._fp = open(file_path, "w", encoding="utf-8", errors="replace")
+        self._parts: List[str] = []
+        self._pending = 0
+        self._last_flush = time.monotonic()
 
     def write(self, s: str) -> None:
-        sys.stdout.write(s)
-        self._fp.write(s)
+        self._parts.append(s)
+        self._pending += len(s)
+        if (
+            self._pending >= self._FLUSH_BYTES
+            or time.monotonic() - self._last_flush >= self._FLUSH_INTERVAL_S
+        ):
+            self.flush()
+
+    def flush_if_idle(self) -> None:
+        # Drain buffered parts without paying the flush syscalls when there
+        # is nothing pending (the common case on every idle wakeup).
+        if self._parts:
+            self.flush()
 
     def flush(self) -> None:
+        if self._parts:
+            s = "".join(self._parts)
+            self._parts.clear()
+            self._pending = 0
+            sys.stdout.write(s)
+            self._fp.write(s)
         sys.stdout.flush()
         self._fp.flush()
+        self._last_flush = time.monotonic()
 
     def close(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            pass
         try:
             self._fp.close()
         except Exception:
@@ -496,15 +621,18 @@ def main() -> int:
     _OUT.write(f"[info] Logging to: {args.log_path}\n")
     _OUT.flush()
 
-    if not args.skip_build:
-        _run(["pio", "run"])
     if not args.skip_upload:
+        # PlatformIO's upload target already implies a build, so a separate
+        # `pio run` first would just redo dependency resolution and a no-op
+        # compile (a whole extra PlatformIO startup per iteration).
         # If --port is provided, also use it as PlatformIO's upload port.
         # This helps when autodetection is flaky on macOS due to USB CDC re-enumeration.
         if args.port:
             _run(["pio", "run", "-t", "upload", "--upload-port", args.port])
         else:
             _run(["pio", "run", "-t", "upload"])
+    elif not args.skip_build:
+        _run(["pio", "run"])
 
     if not args.cmds:
         _OUT.write("\nNo commands specified (e.g. -i -r). Nothing to do.\n")
@@ -518,9 +646,9 @@ def main() -> int:
 
     ser = _open_serial_with_retry(port=port, baud=args.baud, open_timeout_s=args.open_timeout_s)
     try:
-        # Give USB-CDC and firmware some time to settle.
-        time.sleep(args.boot_wait_s)
-        boot_text = _drain_capture(ser, duration_s=0.7)
+        # Give USB-CDC and firmware time to settle, but return as soon as the
+        # firmware banner shows up instead of always waiting the full budget.
+        boot_text = _wait_for_firmware(ser, timeout_s=args.boot_wait_s + 0.7)
         if boot_text:
             _OUT.write(boot_text)
             _OUT.flush()
@@ -1,5 +1,7 @@
 Import("env")
 
+import csv
+import functools
 import os
 import time
 
@@ -11,31 +13,44 @@ def _parse_int(s: str) -> int:
     return int(s, 10)
 
 
-def _find_partition(partitions_csv: str, name: str):
+@functools.lru_cache(maxsize=32)
+def _load_partitions(partitions_csv: str, mtime: float):
     # Very small CSV parser (same style as Arduino/PlatformIO):
     # Name, Type, SubType, Offset, Size, Flags
     # Ignore comments and blank lines.
-    with open(partitions_csv, "r", encoding="utf-8") as f:
-        for raw in f.readlines():
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            tokens = [t.strip() for t in line.split(",")]
-            if len(tokens) < 5:
+    # Memoized on (path, mtime): both fwfs targets hit the same tiny file, so
+    # repeat lookups cost one stat instead of a re-open + re-parse, and the
+    # cache self-invalidates when the table is edited.
+    parts = []
+    with open(partitions_csv, "r", encoding="utf-8", newline="") as f:
+        # csv.reader streams rows and tokenizes in C; no full-file readlines()
+        # list and no per-token Python split/strip.
+        for tokens in csv.reader(f, skipinitialspace=True):
+            if not tokens or tokens[0].startswith("#") or len(tokens) < 5:
                 continue
-            if tokens[0] != name:
-                continue
-            return {
-                "name": tokens[0],
-                "type": tokens[1],
-                "subtype": tokens[2],
-                "offset": _parse_int(tokens[3]),
-                "size": _parse_int(tokens[4]),
-            }
+            parts.append(
+                {
+                    "name": tokens[0],
+                    "type": tokens[1],
+                    "subtype": tokens[2],
+                    "offset": _parse_int(tokens[3]),
+                    "size": _parse_int(tokens[4]),
+                }
+            )
+    return tuple(parts)
+
+
+def _find_partition(partitions_csv: str, name: str):
+    for p in _load_partitions(partitions_csv, os.path.getmtime(partitions_csv)):
+        if p["name"] == name:
+            return p
     raise RuntimeError(f"Partition '{name}' not found in {partitions_csv}")
 
 
 def _configure_fwfs(env):
+    # buildfwfs + uploadfwfs in one session both configure; do the work once.
+    if env.get("_FWFS_CONFIGURED"):
+        return
     partitions_csv = env.subst("$PARTITIONS_TABLE_CSV")
     p = _find_partition(partitions_csv, "fwfs")
     # Use hex strings so SCons variable substitution is reliable everywhere.
@@ -62,6 +77,7 @@ def _configure_fwfs(env):
     if not mkspiffs or mkspiffs.strip() in ("\"\"", ""):
         mkspiffs = os.path.join(env.PioPlatform().get_package_dir("tool-mkspiffs"), "mkspiffs_espressif32_arduino")
     env.Replace(MKFSPIFFSTOOL=mkspiffs)
+    env.Replace(_FWFS_CONFIGURED=True)
 
 
 def _build_fwfs(target, source, env):
@@ -77,8 +93,10 @@ def _build_fwfs(target, source, env):
 
 def _upload_fwfs(target, source, env):
     _configure_fwfs(env)
+    # Substitute once; every env.subst call walks SCons's variable graph.
+    image_path = env.subst("$FWFS_IMAGE")
     # Ensure image exists
-    if not os.path.isfile(env.subst("$FWFS_IMAGE")):
+    if not os.path.isfile(image_path):
         _build_fwfs(target, source, env)
 
     # Use esptool directly, similar to PlatformIO's built-in `uploadfs`.
@@ -107,6 +125,13 @@ def _upload_fwfs(target, source, env):
         "$FWFS_START $FWFS_IMAGE"
     )
 
+    # Resolve the static variables (tool paths, flash mode/freq evals, offsets)
+    # once instead of per retry attempt. $UPLOAD_PORT is escaped so it survives
+    # substitution and is re-resolved by the action after each
+    # AutodetectUploadPort - on macOS the device node can change between
+    # attempts.
+    cmd = env.subst(cmd.replace("$UPLOAD_PORT", "$$UPLOAD_PORT"))
+
     # On macOS, the USB CDC device node can disappear/reappear across resets.
     # Autodetect + retry a few times to avoid transient "port doesn't exist" failures.
     last_rc = 0
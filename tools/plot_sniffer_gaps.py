@@ -36,9 +36,11 @@ def main() -> int:
     )
     args = ap.parse_args()
 
-    # Dependencies: matplotlib (not in repo requirements). Keep runtime error clear.
+    # Dependencies: matplotlib + numpy (not in repo requirements; numpy ships
+    # with matplotlib). Keep runtime error clear.
     try:
         import matplotlib.pyplot as plt  # type: ignore
+        import numpy as np  # type: ignore
     except Exception as e:
         print("ERROR: matplotlib is required for plotting.")
         print("Install into the existing venv:")
@@ -52,25 +54,54 @@ def main() -> int:
     except Exception:
         RectangleSelector = None
 
-    gaps_ms: list[float] = []
-    with open(args.input, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith("time_since_start_of_packet"):
-                continue
-            parts = line.split()
-            if len(parts) < 4:
-                continue
-            # Columns: time_since_start_of_packet_ms gap_ms max_gap_ms byte
-            gaps_ms.append(float(parts[1]))
-
-    if not gaps_ms:
+    # Columns: time_since_start_of_packet_ms gap_ms max_gap_ms byte
+    # numpy's C parser reads the gap column directly; for multi-million-row
+    # captures this is 10-50x faster than a per-line Python split/append loop.
+    try:
+        gaps_ms = np.loadtxt(args.input, skiprows=1, usecols=(1,), dtype=np.float32, ndmin=1)
+    except ValueError:
+        # loadtxt rejects short/malformed rows, but a killed sniffer leaves
+        # a truncated last line behind. Fall back to the tolerant parser,
+        # which skips bad rows the way the old line loop did.
+        gaps_ms = np.atleast_1d(
+            np.genfromtxt(
+                args.input,
+                skip_header=1,
+                usecols=(1,),
+                dtype=np.float32,
+                invalid_raise=False,
+            )
+        )
+        gaps_ms = gaps_ms[~np.isnan(gaps_ms)]
+
+    if gaps_ms.size == 0:
         print(f"No data points found in {args.input}")
         return 1
 
-    x = list(range(len(gaps_ms)))
+    x = np.arange(gaps_ms.size)
+
+    if not args.interactive:
+        # Static PNG: decimate to a min/max envelope per pixel column. The
+        # rendered image is visually identical (every extreme survives) but
+        # Agg rasterizes ~2*target vertices instead of millions. Interactive
+        # mode keeps the full series so zooming stays exact.
+        target = args.dpi * 16
+        if gaps_ms.size > 4 * target:
+            bucket = -(-gaps_ms.size // target)  # ceil division
+            pad = bucket * target - gaps_ms.size
+            g = np.pad(gaps_ms, (0, pad), mode="edge").reshape(target, bucket)
+            env = np.empty(2 * target, dtype=gaps_ms.dtype)
+            env[0::2] = g.min(axis=1)
+            env[1::2] = g.max(axis=1)
+            x = np.repeat(np.arange(target) * bucket, 2)
+            gaps_ms = env
+
+    # Let Agg drop collinear vertices in C and rasterize long paths in chunks
+    # instead of pushing every vertex through the renderer at once.
+    plt.rcParams["path.simplify"] = True
+    plt.rcParams["path.simplify_threshold"] = 1.0
+    plt.rcParams["agg.path.chunksize"] = 10000
+
     plt.figure(figsize=(16, 6))
     plt.plot(x, gaps_ms, linewidth=0.6)
     plt.title("Inter-byte gap (ms) vs sample index")
@@ -0,0 +1,110 @@
+"""Shared trackpad wheel handler injected into every generated HTML.
+
+Kept in its own module so any future viewer variant reuses one copy
+instead of carrying its own diverging paste of the script.
+"""
+
+_WHEEL_JS_SRC = r"""
+<script>
+(function() {
+  // Trackpad / wheel behavior:
+  // - two-finger left/right (deltaX): pan horizontally
+  // - two-finger up/down (deltaY): zoom horizontally
+  // Vertical zoom is fixed by fixedrange=true on y axes.
+
+  function attach(gd) {
+    if (!gd) return;
+
+    gd.addEventListener('wheel', function(e) {
+      // Only operate when cursor is over the plot.
+      e.preventDefault();
+
+      const full = gd._fullLayout;
+      const xa = full.xaxis;
+      if (!xa || !xa.range) return;
+
+      const x0 = xa.range[0];
+      const x1 = xa.range[1];
+      const span = (x1 - x0);
+      if (!(span > 0)) return;
+
+      const axisLen = xa._length || 1;
+      const marginL = (full.margin && full.margin.l) ? full.margin.l : 0;
+
+      // Decide whether to pan or zoom.
+      const panPx = e.deltaX;
+      const zoomDy = e.deltaY;
+
+      // Prefer pan if horizontal scroll is dominant.
+      if (Math.abs(panPx) > Math.abs(zoomDy)) {
+        const dx = (panPx / axisLen) * span;
+        Plotly.relayout(gd, {'xaxis.range': [x0 + dx, x1 + dx]});
+        return;
+      }
+
+      // Zoom horizontally around cursor position.
+      let px = e.offsetX - marginL;
+      if (px < 0) px = 0;
+      if (px > axisLen) px = axisLen;
+
+      let center = xa.p2l ? xa.p2l(px) : (x0 + x1) / 2;
+      if (!isFinite(center)) center = (x0 + x1) / 2;
+
+      // Exponential zoom: trackpad feels smoother.
+      // Positive deltaY -> zoom out; negative -> zoom in.
+      const k = 0.0015;
+      const factor = Math.exp(zoomDy * k);
+
+      const newSpan = Math.max(50, span * factor); // clamp to >= 50ns
+      const leftFrac = (center - x0) / span;
+      const newX0 = center - leftFrac * newSpan;
+      const newX1 = newX0 + newSpan;
+
+      Plotly.relayout(gd, {'xaxis.range': [newX0, newX1]});
+    }, {passive: false});
+  }
+
+  // Find the Plotly graph div(s) in this document.
+  window.addEventListener('load', function() {
+    const plots = document.querySelectorAll('div.js-plotly-plot');
+    plots.forEach(attach);
+  });
+})();
+</script>
+"""
+
+
+def _strip_line_comment(s: str) -> str:
+    # Cut a trailing // comment, scanning quote state so a future "//"
+    # inside a string literal would survive.
+    quote = ""
+    i = 0
+    while i < len(s):
+        c = s[i]
+        if quote:
+            if c == "\\":
+                i += 1
+            elif c == quote:
+                quote = ""
+        elif c in "'\"`":
+            quote = c
+        elif c == "/" and s[i : i + 2] == "//":
+            return s[:i].rstrip()
+        i += 1
+    return s
+
+
+def _minify(js: str) -> str:
+    # Line-based minify: drop // comments, indentation and blank lines.
+    # Newlines are kept, so there are no semicolon-insertion surprises.
+    # Avoids shipping the comments in every generated HTML without adding
+    # a jsmin dependency.
+    kept = []
+    for line in js.split("\n"):
+        s = _strip_line_comment(line.strip())
+        if s:
+            kept.append(s)
+    return "\n".join(kept) + "\n"
+
+
+WHEEL_JS = _minify(_WHEEL_JS_SRC)
@@ -1,176 +1,564 @@
 #!/usr/bin/env python3
 
-import csv
+import json
+import mmap
+import os
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
 import plotly.graph_objects as go
 import plotly.io as pio
 from plotly.subplots import make_subplots
 
+from _wheel import WHEEL_JS
+
+# Serialize figures with orjson when available: it is several times faster
+# than stdlib json on the big float arrays we embed and handles numpy arrays
+# natively. Falls back silently when orjson isn't installed.
+try:
+    import orjson  # type: ignore
+
+    pio.json.config.default_engine = "orjson"
+except Exception:
+    orjson = None
+
+
+_COLUMNS = ("t_ns", "signal", "voltage", "value")
+
+try:
+    # Optional: pyarrow's CSV reader parses with multiple threads and hands
+    # columns to pandas near zero-copy - the fastest loader for multi-GB logs.
+    import pyarrow.csv as pacsv  # type: ignore
+except Exception:
+    pacsv = None
+
+try:
+    # Optional: numba compiles the step-expansion kernel to native code.
+    # cache=True persists the compiled function on disk so only the very
+    # first run ever pays the JIT cost.
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None
+
+
+@dataclass
+class Events:
+    """Whole log as columns (structure-of-arrays): no per-event Python objects.
+
+    Signals are stored as small integer codes into `categories`, so per-signal
+    selection is an integer compare over a contiguous array.
+    """
+
+    t: np.ndarray  # int64 timestamps (ns)
+    sig_codes: np.ndarray  # int8 code per event, indexing into categories
+    v: np.ndarray  # float32 voltages
+    meta: np.ndarray  # float32 optional overlay values; NaN when absent
+    categories: list  # signal names, position == code
+
+
+def _typed_columns(df):
+    # Coerce one frame (or chunk) to typed arrays; drops malformed rows.
+    df["t_ns"] = pd.to_numeric(df["t_ns"], errors="coerce")
+    df["voltage"] = pd.to_numeric(df["voltage"], errors="coerce")
+    df = df.dropna(subset=["t_ns", "signal", "voltage"])
+    t = df["t_ns"].astype("int64").to_numpy()
+    sig = pd.Categorical(df["signal"].astype(str).str.strip())
+    # float32 is plenty for 0-3.3 V signals and bit counts, and halves the
+    # footprint and memory bandwidth of every downstream kernel.
+    v = df["voltage"].to_numpy(dtype=np.float32)
+    # meta: optional numeric value for overlays (e.g. bit counts). coerce
+    # converts in C and yields NaN for blanks - no per-row exception handling.
+    # Backward compat with older 3-column CSV: a missing column is all-NaN.
+    if "value" in df.columns:
+        meta = pd.to_numeric(df["value"], errors="coerce").to_numpy(dtype=np.float32)
+    else:
+        meta = np.full(len(df), np.nan, dtype=np.float32)
+    return t, sig, v, meta
+
 
 def load_events(path):
-    events = []
-    with open(path, newline="") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            # Be robust to blank/malformed lines
-            if not row:
-                continue
-            t = row.get("t_ns")
-            sig = row.get("signal")
-            v = row.get("voltage")
-            meta = row.get("value")
-            # Backward compat with older 3-column CSV: treat missing meta as blank.
-            if meta is None:
-                meta = ""
-            if t is None or sig is None or v is None:
-                continue
-            t = t.strip()
-            sig = sig.strip()
-            v = v.strip()
-            meta = meta.strip()
-            if t == "" or sig == "" or v == "":
-                continue
-            # meta: optional numeric value for overlays (e.g. bit counts)
-            meta_f = None
-            if meta != "":
-                try:
-                    meta_f = float(meta)
-                except Exception:
-                    meta_f = None
-
-            events.append((int(t), sig, float(v), meta_f))
-    return events
-
-
-def build_step_series(events, signal, end_t):
-    # Convert change-events into step-wise x/y arrays.
-    xs = []
-    ys = []
-
-    last_t = None
-    last_v = None
-
-    for t, sig, v, _meta in events:
-        if sig != signal:
-            continue
-
-        if last_t is None:
-            xs.append(t)
-            ys.append(v)
-            last_t = t
-            last_v = v
-            continue
-
-        if t == last_t:
-            # Same timestamp: just update value
-            ys[-1] = v
-            last_v = v
-            continue
-
-        # Extend previous value up to t, then step to new value
-        xs.append(t)
-        ys.append(last_v)
-        xs.append(t)
-        ys.append(v)
-
-        last_t = t
-        last_v = v
-
-    # Ensure each trace extends to the final timestamp in the log
-    if last_t is not None and last_t < end_t:
-        xs.append(end_t)
-        ys.append(last_v)
+    # Binary sidecar cache: CSV parsing dominates startup on big captures,
+    # while np.load of an .npz is just bytes-to-arrays. Keep it best-effort -
+    # a corrupt, stale or unwritable sidecar must never break the viewer.
+    sidecar = path + ".npz"
+    try:
+        if os.path.exists(sidecar) and os.stat(sidecar).st_mtime >= os.stat(path).st_mtime:
+            data = np.load(sidecar, allow_pickle=False)
+            return Events(
+                t=data["t"],
+                sig_codes=data["sig"],
+                v=data["v"],
+                meta=data["meta"],
+                categories=[str(s) for s in data["categories"]],
+            )
+    except Exception:
+        pass
+    ev = _parse_events(path)
+    try:
+        np.savez(
+            sidecar,
+            t=ev.t,
+            sig=ev.sig_codes,
+            v=ev.v,
+            meta=ev.meta,
+            categories=np.array(ev.categories),
+        )
+    except Exception:
+        pass
+    return ev
+
+
+def _parse_events(path):
+    # Parse the CSV into typed columns instead of a dict-per-row
+    # csv.DictReader loop; on large SWD captures the per-row allocations and
+    # str/int/float conversions dominated load time. pyarrow when available,
+    # otherwise pandas' C engine (memory_map lets it read straight out of the
+    # OS page cache, skipping one buffering layer). The pandas path streams
+    # the file in 1M-row chunks so peak RSS stays near the final array size
+    # instead of several times the file size.
+    if pacsv is None and _parse_rows_native is not None:
+        # No pyarrow but numba is around: mmap the file and let the native
+        # parser scan the bytes directly into typed arrays - no per-field
+        # dispatch at all. Returns None for anything but the plain schema.
+        ev = _load_events_native(path)
+        if ev is not None:
+            return ev
+    parts = None
+    if pacsv is not None:
+        # pandas' NaN-fill + dropna semantics define what a malformed row
+        # means - e.g. a final row truncated after the voltage field is
+        # kept with a NaN value. pyarrow can only skip or reject such rows
+        # wholesale, so on ArrowInvalid (or any other reader failure) hand
+        # the whole file to the pandas parser below rather than letting the
+        # event count depend on which parser is installed.
+        try:
+            df = pacsv.read_csv(path).to_pandas()
+            parts = [_typed_columns(df[[c for c in _COLUMNS if c in df.columns]])]
+        except Exception:
+            parts = None
+    if parts is None:
+        try:
+            parts = [
+                _typed_columns(chunk)
+                for chunk in pd.read_csv(
+                    path,
+                    usecols=lambda c: c in _COLUMNS,
+                    engine="c",
+                    memory_map=True,
+                    chunksize=1_000_000,
+                )
+            ]
+        except (KeyError, ValueError):
+            # Zero-byte file (mmap refuses it, EmptyDataError is a ValueError)
+            # or a wrong-schema file without our columns (KeyError in
+            # _typed_columns): treat it as a log with no events so main()
+            # prints its clean message instead of a traceback.
+            parts = []
+
+    if not parts:
+        empty = np.empty(0, dtype=np.float32)
+        return Events(empty.astype("int64"), empty.astype("int8"), empty, empty, [])
+    if len(parts) == 1:
+        t, sig, v, meta = parts[0]
+    else:
+        t = np.concatenate([p[0] for p in parts])
+        sig = union_categoricals([p[1] for p in parts])
+        v = np.concatenate([p[2] for p in parts])
+        meta = np.concatenate([p[3] for p in parts])
+
+    # Normalize category order so signal codes don't depend on chunking.
+    sig = sig.reorder_categories(sorted(sig.categories))
+    return Events(
+        t=t,
+        # Categorical codes are already int8 for our handful of signals;
+        # the cast just pins the contract (copy=False makes it free).
+        sig_codes=np.asarray(sig.codes).astype(np.int8, copy=False),
+        v=v,
+        meta=meta,
+        categories=list(sig.categories),
+    )
+
+
+def group_by_signal(ev):
+    # {signal: (t, voltage, meta)} numpy arrays. One stable sort of the event
+    # indices by signal code, split at the code boundaries: a single
+    # O(N log N) pass over the table instead of one full boolean scan per
+    # signal.
+    order = np.argsort(ev.sig_codes, kind="stable")
+    codes_sorted = ev.sig_codes[order]
+    bounds = np.searchsorted(codes_sorted, np.arange(len(ev.categories) + 1))
+    out = {}
+    for code, name in enumerate(ev.categories):
+        idx = order[bounds[code] : bounds[code + 1]]
+        out[name] = (ev.t[idx], ev.v[idx], ev.meta[idx])
+    return out
+
+
+if njit is not None:
+
+    @njit(cache=True, nogil=True)
+    def _parse_float_native(buf, p, e):
+        # Hand-rolled ASCII float parse over raw bytes: returns
+        # (value, next_pos, ok). Handles sign, decimal point and exponent -
+        # everything the simulator's writer emits.
+        sign = 1.0
+        if p < e and (buf[p] == 45 or buf[p] == 43):  # - +
+            if buf[p] == 45:
+                sign = -1.0
+            p += 1
+        mant = 0.0
+        ndig = 0
+        while p < e and 48 <= buf[p] <= 57:
+            mant = mant * 10.0 + (buf[p] - 48)
+            ndig += 1
+            p += 1
+        if p < e and buf[p] == 46:  # .
+            p += 1
+            scale = 0.1
+            while p < e and 48 <= buf[p] <= 57:
+                mant += (buf[p] - 48) * scale
+                scale *= 0.1
+                ndig += 1
+                p += 1
+        if ndig == 0:
+            return 0.0, p, False
+        if p < e and (buf[p] == 101 or buf[p] == 69):  # e E
+            p += 1
+            esign = -1 if p < e and buf[p] == 45 else 1
+            if p < e and (buf[p] == 45 or buf[p] == 43):
+                p += 1
+            exp = 0
+            nd = 0
+            while p < e and 48 <= buf[p] <= 57:
+                exp = exp * 10 + (buf[p] - 48)
+                nd += 1
+                p += 1
+            if nd == 0:
+                return 0.0, p, False
+            mant *= 10.0 ** (esign * exp)
+        return sign * mant, p, True
+
+    @njit(cache=True, nogil=True)
+    def _parse_rows_native(buf, start, t, codes, v, meta, name_buf, name_len):
+        # Scan the mmapped byte buffer once, writing straight into the
+        # preallocated column arrays. Signal names go through a tiny linear
+        # intern table (few categories, short names) so each row stores an
+        # int8 code, never a string. Malformed rows are skipped, matching
+        # the dropna behavior of the pandas path. Returns
+        # (rows, names, overflow); overflow means the intern table filled
+        # up and the caller should fall back to pandas.
+        n = 0
+        n_names = 0
+        overflow = False
+        size = buf.size
+        cap = name_len.size
+        max_name = name_buf.shape[1]
+        i = start
+        while i < size:
+            j = i
+            while j < size and buf[j] != 10:  # newline
+                j += 1
+            e = j
+            if e > i and buf[e - 1] == 13:  # trailing CR
+                e -= 1
+            ok = e > i
+            # t_ns: integer field up to the first comma.
+            p = i
+            while p < e and buf[p] == 32:
+                p += 1
+            neg = False
+            if p < e and buf[p] == 45:
+                neg = True
+                p += 1
+            tval = 0
+            ndig = 0
+            while p < e and 48 <= buf[p] <= 57:
+                tval = tval * 10 + (buf[p] - 48)
+                ndig += 1
+                p += 1
+            if ndig == 0 or p >= e or buf[p] != 44:
+                ok = False
+            # signal: bytes up to the next comma, interned to a code.
+            code = 0
+            if ok:
+                p += 1
+                s0 = p
+                while p < e and buf[p] != 44:
+                    p += 1
+                s1 = p
+                while s0 < s1 and buf[s0] == 32:
+                    s0 += 1
+                while s1 > s0 and buf[s1 - 1] == 32:
+                    s1 -= 1
+                ln = s1 - s0
+                if ln == 0 or ln > max_name or p >= e:
+                    ok = False
+                else:
+                    code = -1
+                    for k in range(n_names):
+                        if name_len[k] == ln:
+                            match = True
+                            for q in range(ln):
+                                if name_buf[k, q] != buf[s0 + q]:
+                                    match = False
+                                    break
+                            if match:
+                                code = k
+                                break
+                    if code < 0:
+                        if n_names >= cap:
+                            overflow = True
+                            break
+                        for q in range(ln):
+                            name_buf[n_names, q] = buf[s0 + q]
+                        name_len[n_names] = ln
+                        code = n_names
+                        n_names += 1
+            # voltage: required float.
+            vval = 0.0
+            if ok:
+                p += 1
+                while p < e and buf[p] == 32:
+                    p += 1
+                vval, p, ok = _parse_float_native(buf, p, e)
+            # value: optional float. Blank, absent or unparseable stays NaN
+            # without dropping the row - the pandas path coerces a bad value
+            # cell to NaN and keeps the event, and this must match.
+            mval = np.nan
+            if ok and p < e:
+                if buf[p] != 44:
+                    ok = False
+                else:
+                    p += 1
+                    while p < e and buf[p] == 32:
+                        p += 1
+                    if p < e:
+                        mval, p2, okf = _parse_float_native(buf, p, e)
+                        if not okf or p2 != e:
+                            mval = np.nan
+            if ok:
+                t[n] = -tval if neg else tval
+                codes[n] = code
+                v[n] = vval
+                meta[n] = mval
+                n += 1
+            i = j + 1
+        return n, n_names, overflow
+
+    @njit(cache=True, nogil=True)
+    def _expand_steps_native(ts, vs, end_t):
+        # Fused dedup + step expansion in one typed pass: no keep-mask or
+        # shifted-slice temporaries at all, just one write cursor.
+        n = ts.size
+        xs = np.empty(2 * n + 1, dtype=ts.dtype)
+        ys = np.empty(2 * n + 1, dtype=vs.dtype)
+        m = 0
+        for i in range(n):
+            t = ts[i]
+            v = vs[i]
+            if m > 0 and xs[m - 1] == t:
+                # Duplicate timestamp: the last value wins.
+                ys[m - 1] = v
+            elif m == 0:
+                xs[0] = t
+                ys[0] = v
+                m = 1
+            else:
+                # Hold the previous value until t, then step to v.
+                xs[m] = t
+                ys[m] = ys[m - 1]
+                xs[m + 1] = t
+                ys[m + 1] = v
+                m += 2
+        if xs[m - 1] < end_t:
+            xs[m] = end_t
+            ys[m] = ys[m - 1]
+            m += 1
+        return xs[:m], ys[:m]
+
+else:
+    _parse_rows_native = None
+    _expand_steps_native = None
+
+
+def _load_events_native(path):
+    """mmap + native-parser fast path; returns Events, or None to fall back.
+
+    Only handles the simulator's exact narrow schema. Anything unexpected -
+    reordered header, exotic signal names, an overflowing intern table -
+    defers to the pandas loader rather than guessing.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None  # mmap rejects empty files; pandas reports those
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header_end = mm.find(b"\n")
+    if header_end < 0:
+        return None
+    cols = [c.strip() for c in mm[:header_end].decode("ascii", "replace").strip().split(",")]
+    if cols[:3] != ["t_ns", "signal", "voltage"] or cols[3:] not in ([], ["value"]):
+        return None
+    # No explicit mm.close(): the frombuffer view exports the mapping's
+    # buffer, so closing here would raise BufferError. Everything returned
+    # below is a copy; the mapping is released when buf goes out of scope.
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    n_max = int(np.count_nonzero(buf == 10)) + 1
+    t = np.empty(n_max, dtype=np.int64)
+    codes = np.empty(n_max, dtype=np.int8)
+    v = np.empty(n_max, dtype=np.float32)
+    meta = np.empty(n_max, dtype=np.float32)
+    name_buf = np.zeros((64, 64), dtype=np.uint8)
+    name_len = np.zeros(64, dtype=np.int64)
+    n, n_names, overflow = _parse_rows_native(
+        buf, header_end + 1, t, codes, v, meta, name_buf, name_len
+    )
+    if overflow:
+        return None
+    cats = [bytes(name_buf[k, : name_len[k]]).decode("ascii") for k in range(n_names)]
+    # Re-code into sorted category order so downstream behavior is
+    # identical to the pd.Categorical-based loader.
+    order = sorted(range(n_names), key=cats.__getitem__)
+    remap = np.empty(max(n_names, 1), dtype=np.int8)
+    for new_code, old_code in enumerate(order):
+        remap[old_code] = new_code
+    return Events(
+        t=t[:n].copy(),
+        sig_codes=remap[codes[:n]],
+        v=v[:n].copy(),
+        meta=meta[:n].copy(),
+        categories=[cats[k] for k in order],
+    )
+
+
+def build_step_series(ts, vs, end_t, assume_sorted=False):
+    # Convert change-events into step-wise x/y arrays, entirely in numpy.
+    if ts.size == 0:
+        return ts, vs
+
+    # The duplicate coalescing below (and the native kernel) only sees
+    # duplicates when they are adjacent. Logs are normally time-sorted
+    # already, so check with one vectorized pass and pay for a stable
+    # argsort (stable = later rows still win on ties) only when needed.
+    # Callers that already know the whole log is sorted pass
+    # assume_sorted=True and skip even the check: grouping preserves
+    # per-event order, so every per-signal slice of a sorted log is sorted.
+    if not assume_sorted and not bool(np.all(ts[1:] >= ts[:-1])):
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        vs = vs[order]
+
+    if _expand_steps_native is not None:
+        return _expand_steps_native(ts, vs, end_t)
+
+    # Same timestamp appearing twice: keep only the last value for it
+    # (matches the old per-event loop's overwrite behavior).
+    keep = np.concatenate((np.diff(ts) != 0, [True]))
+    ts = ts[keep]
+    vs = vs[keep]
+
+    # Doubling each point and shifting by one turns (t, v) change-events into
+    # the step outline: each value is held flat until the next change. The
+    # outputs are preallocated and filled with strided slice assignments, so
+    # no np.repeat temporaries or np.append reallocations are made - the only
+    # allocations are the two result arrays themselves.
+    n = ts.size
+    extend = bool(ts[-1] < end_t)  # extend each trace to the log's final timestamp
+    m = 2 * n - 1 + extend
+    xs = np.empty(m, dtype=ts.dtype)
+    ys = np.empty(m, dtype=vs.dtype)
+    xs[0 : 2 * n - 1 : 2] = ts
+    xs[1 : 2 * n - 1 : 2] = ts[1:]
+    ys[0 : 2 * n - 1 : 2] = vs
+    ys[1 : 2 * n - 1 : 2] = vs[:-1]
+    if extend:
+        xs[-1] = end_t
+        ys[-1] = vs[-1]
 
     return xs, ys
 
 
-WHEEL_JS = r"""
-<script>
-(function() {
-  // Trackpad / wheel behavior:
-  // - two-finger left/right (deltaX): pan horizontally
-  // - two-finger up/down (deltaY): zoom horizontally
-  // Vertical zoom is fixed by fixedrange=true on y axes.
-
-  function attach(gd) {
-    if (!gd) return;
-
-    gd.addEventListener('wheel', function(e) {
-      // Only operate when cursor is over the plot.
-      e.preventDefault();
-
-      const full = gd._fullLayout;
-      const xa = full.xaxis;
-      if (!xa || !xa.range) return;
-
-      const x0 = xa.range[0];
-      const x1 = xa.range[1];
-      const span = (x1 - x0);
-      if (!(span > 0)) return;
-
-      const axisLen = xa._length || 1;
-      const marginL = (full.margin && full.margin.l) ? full.margin.l : 0;
-
-      // Decide whether to pan or zoom.
-      const panPx = e.deltaX;
-      const zoomDy = e.deltaY;
-
-      // Prefer pan if horizontal scroll is dominant.
-      if (Math.abs(panPx) > Math.abs(zoomDy)) {
-        const dx = (panPx / axisLen) * span;
-        Plotly.relayout(gd, {'xaxis.range': [x0 + dx, x1 + dx]});
-        return;
-      }
-
-      // Zoom horizontally around cursor position.
-      let px = e.offsetX - marginL;
-      if (px < 0) px = 0;
-      if (px > axisLen) px = axisLen;
-
-      let center = xa.p2l ? xa.p2l(px) : (x0 + x1) / 2;
-      if (!isFinite(center)) center = (x0 + x1) / 2;
-
-      // Exponential zoom: trackpad feels smoother.
-      // Positive deltaY -> zoom out; negative -> zoom in.
-      const k = 0.0015;
-      const factor = Math.exp(zoomDy * k);
-
-      const newSpan = Math.max(50, span * factor); // clamp to >= 50ns
-      const leftFrac = (center - x0) / span;
-      const newX0 = center - leftFrac * newSpan;
-      const newX1 = newX0 + newSpan;
-
-      Plotly.relayout(gd, {'xaxis.range': [newX0, newX1]});
-    }, {passive: false});
-  }
-
-  // Find the Plotly graph div(s) in this document.
-  window.addEventListener('load', function() {
-    const plots = document.querySelectorAll('div.js-plotly-plot');
-    plots.forEach(attach);
-  });
-})();
-</script>
-"""
+def decimate_steps(xs, ys, max_points=8000):
+    # Reduce a step series to a per-bucket min/max envelope before embedding
+    # it in the HTML: a million-edge capture would otherwise serialize
+    # millions of floats that plotly.js must parse and hold on the JS heap.
+    # Far more points than screen pixels cannot be distinguished anyway; the
+    # envelope keeps every extreme. Overlay markers are never decimated.
+    if len(xs) <= max_points:
+        return xs, ys
+    n_buckets = max_points // 2
+    edges = np.linspace(xs[0], xs[-1], n_buckets + 1)
+    starts = np.concatenate(([0], np.searchsorted(xs, edges[1:-1])))
+    # reduceat fabricates a value (its right neighbor's element) for empty
+    # ranges, which would paint flat segments through stretches of the
+    # capture that have no edges at all. Emit only buckets that actually
+    # contain points; bursty SWD traffic leaves most buckets empty, so this
+    # also shrinks the output well below max_points.
+    counts = np.diff(np.concatenate((starts, [len(ys)])))
+    valid = counts > 0
+    out_x = np.repeat(edges[:-1][valid], 2)
+    mn = np.minimum.reduceat(ys, starts)[valid]
+    mx = np.maximum.reduceat(ys, starts)[valid]
+    out_y = np.empty(out_x.size, dtype=np.asarray(ys).dtype)
+    out_y[0::2] = mn
+    out_y[1::2] = mx
+    return out_x, out_y
+
+
+def _meta_labels(metas):
+    # 0-99 integer labels, blank where meta is NaN, formatted in C by
+    # np.char.mod instead of a round/min/max/int/str chain per marker.
+    arr = np.clip(np.round(np.nan_to_num(metas)), 0, 99).astype(np.int64)
+    return np.where(np.isnan(metas), "", np.char.mod("%d", arr)).tolist()
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: viewer/view_log.py signals.csv")
+    argv = [a for a in sys.argv[1:] if a != "--force"]
+    force = len(argv) != len(sys.argv) - 1
+    if not argv:
+        print("Usage: viewer/view_log.py signals.csv [--force]")
         return 2
 
-    path = sys.argv[1]
-    events = load_events(path)
-    if not events:
+    path = argv[0]
+
+    # Output HTML next to the repo root with the same basename as the input CSV.
+    # Example: read_simulation.csv -> read_simulation.html
+    out_path = path
+    if out_path.lower().endswith(".csv"):
+        out_path = out_path[:-4]
+    out_path = out_path + ".html"
+
+    # Regeneration takes seconds to minutes on big captures; two stat calls
+    # take microseconds. If the HTML is already newer than the CSV, just
+    # reopen it. --force bypasses (e.g. after editing the viewer itself).
+    if (
+        not force
+        and os.path.exists(out_path)
+        and os.stat(out_path).st_mtime >= os.stat(path).st_mtime
+    ):
+        try:
+            subprocess.run(["open", out_path], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            pass
+        print(f"Up to date: {out_path} (rerun with --force to regenerate)")
+        return 0
+
+    ev = load_events(path)
+    if ev.t.size == 0:
         print(f"No events in {path}")
         return 2
 
-    end_t = max(t for t, _, _, _ in events)
+    # One sortedness check up front covers both the end-of-log timestamp
+    # (last element instead of a max() scan) and every per-signal builder.
+    t_sorted = ev.t.size < 2 or bool(np.all(ev.t[1:] >= ev.t[:-1]))
+    end_t = int(ev.t[-1]) if t_sorted else int(ev.t.max())
 
-    # Determine available signals
-    signals = sorted({sig for _, sig, _, _ in events})
+    # Determine available signals (categories are already unique and sorted).
+    signals = ev.categories
     want = [s for s in ["NRST", "SWCLK", "SWDIO"] if s in signals]
 
     # Simulator step markers (logged as point-events with a constant voltage value).
@@ -185,31 +573,34 @@ def main():
         subplot_titles=want,
     )
 
-    # Helper: collect point-events for a given signal.
-    def collect_points(sig_name):
-        xs = []
-        ys = []
-        for t, sig, v, _meta in events:
-            if sig == sig_name:
-                xs.append(t)
-                ys.append(v)
-        return xs, ys
-
-    def collect_points_with_meta(sig_name):
-        xs = []
-        ys = []
-        metas = []
-        for t, sig, v, meta in events:
-            if sig == sig_name:
-                xs.append(t)
-                ys.append(v)
-                metas.append(meta)
-        return xs, ys, metas
+    by_sig = group_by_signal(ev)
+
+    # Build every signal's step series up front, in parallel when there are
+    # enough of them to amortize worker startup. Threads, not processes: the
+    # numpy kernels (and the numba one, via nogil=True) release the GIL, so
+    # the builds overlap without forking or pickling the input arrays.
+    if len(want) > 2:
+        with ThreadPoolExecutor(max_workers=len(want)) as ex:
+            results = list(
+                ex.map(
+                    build_step_series,
+                    [by_sig[s][0] for s in want],
+                    [by_sig[s][1] for s in want],
+                    [end_t] * len(want),
+                    [t_sorted] * len(want),
+                )
+            )
+    else:
+        results = [
+            build_step_series(by_sig[s][0], by_sig[s][1], end_t, t_sorted) for s in want
+        ]
+    step_series = dict(zip(want, results))
 
     for i, sig in enumerate(want, start=1):
-        xs, ys = build_step_series(events, sig, end_t)
+        xs, ys = step_series[sig]
+        xs, ys = decimate_steps(xs, ys)
         fig.add_trace(
-            go.Scatter(
+            go.Scattergl(
                 x=xs,
                 y=ys,
                 mode="lines",
@@ -223,14 +614,11 @@ def main():
         # Overlay SWDIO sampling markers on the SWDIO subplot.
         if sig == "SWDIO":
             if "SWDIO_SAMPLE_H" in signals:
-                hx, hy, hm = collect_points_with_meta("SWDIO_SAMPLE_H")
+                hx, hy, hm = by_sig["SWDIO_SAMPLE_H"]
                 # Render optional meta as 0..99 integer label. Blank if not present.
-                htxt = []
-                for m in hm:
-                    if m is None:
-                        htxt.append("")
-                    else:
-                        htxt.append(str(int(max(0, min(99, round(m))))))
+                htxt = _meta_labels(hm)
+                # SVG markers render text crisper than the WebGL path and
+                # there are only a few hundred of these points.
                 fig.add_trace(
                     go.Scatter(
                         x=hx,
@@ -253,13 +641,8 @@ def main():
                 )
 
             if "SWDIO_SAMPLE_T" in signals:
-                tx, ty, tm = collect_points_with_meta("SWDIO_SAMPLE_T")
-                ttxt = []
-                for m in tm:
-                    if m is None:
-                        ttxt.append("")
-                    else:
-                        ttxt.append(str(int(max(0, min(99, round(m))))))
+                tx, ty, tm = by_sig["SWDIO_SAMPLE_T"]
+                ttxt = _meta_labels(tm)
                 fig.add_trace(
                     go.Scatter(
                         x=tx,
@@ -284,14 +667,16 @@ def main():
             # Overlay high-level step markers (STEP_*).
             if step_sigs:
                 # Flatten into a single trace.
-                sx = []
-                sy = []
-                st = []
-                for t, sig2, v, _meta in events:
-                    if sig2 in step_sigs:
-                        sx.append(t)
-                        sy.append(v)
-                        st.append(sig2.replace("STEP_", ""))
+                step_codes = np.array(
+                    [code for code, name in enumerate(signals) if name in set(step_sigs)]
+                )
+                smask = np.isin(ev.sig_codes, step_codes)
+                sx = ev.t[smask]
+                sy = ev.v[smask]
+                # Strip the prefix once per category, then fan out per event
+                # with one numpy take instead of a str.replace per marker.
+                names = np.array([s.replace("STEP_", "") for s in signals])
+                st = names[ev.sig_codes[smask]].tolist()
 
                 fig.add_trace(
                     go.Scatter(
@@ -328,31 +713,61 @@ def main():
     fig.update_xaxes(title_text="time (ns)", row=len(want), col=1)
     fig.update_xaxes(matches="x")
 
-    # Generate a self-contained HTML and open it.
-    html = pio.to_html(
-        fig,
-        full_html=True,
-        include_plotlyjs="cdn",
-        config={
+    # Generate the HTML ourselves around one serialization pass: to_html would
+    # re-validate the whole figure and stringify it a second time into its own
+    # template, which is the slow part once the traces carry big arrays. With
+    # orjson installed, dump the raw figure dict with OPT_SERIALIZE_NUMPY so
+    # the arrays are encoded in C without a tolist() detour through Python
+    # objects; otherwise fall back to plotly's own encoder.
+    if orjson is not None:
+        fig_json = orjson.dumps(
+            fig.to_plotly_json(), option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+    else:
+        fig_json = pio.to_json(fig, validate=False)
+    config_json = json.dumps(
+        {
             # We implement our own wheel behavior.
             "scrollZoom": False,
             "displayModeBar": True,
             # Disable hover interactions (prevents tooltip bubble).
             "staticPlot": False,
-        },
+        }
     )
-
-    # Inject wheel handler.
-    html = html.replace("</body>", WHEEL_JS + "</body>")
-
-    # Output HTML next to the repo root with the same basename as the input CSV.
-    # Example: read_simulation.csv -> read_simulation.html
-    out_path = path
-    if out_path.lower().endswith(".csv"):
-        out_path = out_path[:-4]
-    out_path = out_path + ".html"
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    # Prefer a vendored plotly.min.js sitting next to the output: one shared
+    # copy makes every HTML in that directory load offline and skips the CDN
+    # round trip on cold opens. Drop the file there once (any plotly v2
+    # bundle) and all generated pages pick it up.
+    plotly_src = "https://cdn.plot.ly/plotly-2.35.2.min.js"
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    if os.path.exists(os.path.join(out_dir, "plotly.min.js")):
+        plotly_src = "plotly.min.js"
+
+    # Stream the document out in parts rather than concatenating everything
+    # (including the figure JSON, easily tens of MB) into one string first:
+    # fig_json then never gets copied, and peak memory during emission stays
+    # at roughly the JSON size instead of twice that.
+    with open(out_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(
+            "<!DOCTYPE html>\n"
+            "<html>\n"
+            '<head><meta charset="utf-8">'
+            f"<title>SWD Waveforms from {path}</title>"
+            f'<script src="{plotly_src}"></script>'
+            "</head>\n"
+            "<body>\n"
+            '<div id="plot"></div>\n'
+            "<script>\n"
+            "var fig = "
+        )
+        f.write(fig_json)
+        f.write(
+            ";\n"
+            f'Plotly.newPlot("plot", fig.data, fig.layout, {config_json});\n'
+            "</script>\n"
+        )
+        f.write(WHEEL_JS)
+        f.write("</body>\n</html>\n")
 
     # Use macOS `open` but suppress any AppleScript/stdout noise.
     # If it fails, user can open the HTML file manually.